@@ -1,27 +1,147 @@
 import streamlit as st
+import pandas as pd
 import requests
+import diskcache
+import orjson
+import sqlite3
+import time
 from datetime import date
+from pathlib import Path
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# --- HTTP Session ---
+
+@st.cache_resource
+def _get_session():
+    """Builds the pooled HTTP session shared by every rerun.
+
+    Streamlit re-executes this script on each interaction, so the session is
+    kept as a cached resource to actually reuse connections (and their TLS
+    handshakes) between conversions. Transient 429/5xx responses are retried
+    with backoff before surfacing an error.
+    """
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=20,
+        # At most 3 attempts, only one after a read timeout, and Retry-After is
+        # ignored so a 429 cannot stall the worker for an unbounded time.
+        max_retries=Retry(
+            total=2,
+            read=1,
+            backoff_factor=0.3,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=("GET",),
+            respect_retry_after_header=False,
+        ),
+    ))
+    session.headers.update({"User-Agent": "streamlit-currency/1.0", "Accept-Encoding": "gzip"})
+    return session
+
+
+# --- On-disk Cache ---
+
+# Live rates are shared across worker restarts through a disk cache that
+# sits behind st.cache_data (the fast in-process layer).
+_CACHE_DIR = Path(__file__).parent / ".cache" / "fx"
+_LIVE_TTL = 3600
+_DISK_ERRORS = (OSError, sqlite3.Error, diskcache.Timeout)
+
+
+@st.cache_resource
+def _get_disk_cache():
+    """Opens the on-disk rates cache, or returns None if it is unavailable."""
+    try:
+        return diskcache.Cache(str(_CACHE_DIR))
+    except _DISK_ERRORS:
+        return None
+
+
+def _disk_get(key):
+    """Reads a key from the disk cache, treating any cache failure as a miss."""
+    cache = _get_disk_cache()
+    if cache is None:
+        return None
+    try:
+        return cache.get(key)
+    except _DISK_ERRORS:
+        return None
+
+
+def _disk_set(key, value, expire):
+    """Writes a key to the disk cache, ignoring cache failures."""
+    cache = _get_disk_cache()
+    if cache is None:
+        return
+    try:
+        cache.set(key, value, expire=expire)
+    except _DISK_ERRORS:
+        pass
+
 
 # --- API Function ---
 
-# Caching the data fetching function for performance.
-# It will only rerun after 1 hour (3600 seconds).
-@st.cache_data(ttl=3600)
-def get_live_rates(base_currency):
+# Both cache layers are keyed on the same hourly window, so a rate is never
+# served more than an hour after the window it was fetched in began,
+# instead of the disk and in-process TTLs stacking.
+def _ttl_window():
+    return int(time.time() // _LIVE_TTL)
+
+
+class RatesAPIError(Exception):
+    """Raised when the API answers but reports an unsuccessful result."""
+
+
+# Failures are raised rather than returned so st.cache_data never memoises
+# them; get_live_rates decides whether to show them.
+@st.cache_data(ttl=_LIVE_TTL, max_entries=128, show_spinner=False)
+def _fetch_live_rates(base_currency, window):
     """Fetches the latest exchange rates from the API."""
+    key = f"live:{base_currency}:{window}"
+    hit = _disk_get(key)
+    if hit is not None:
+        return hit
+
     api_url = f"https://open.er-api.com/v6/latest/{base_currency}"
+    response = _get_session().get(api_url, timeout=(3.05, 5))
+    response.raise_for_status()  # Raises an HTTPError for bad responses (4xx or 5xx)
+    data = orjson.loads(response.content)
+    if data.get("result") != "success":
+        raise RatesAPIError(data.get("error-type", "Unknown error"))
+    _disk_set(key, data["rates"], expire=_LIVE_TTL)
+    return data["rates"]
+
+
+def get_live_rates(base_currency):
+    """Returns the latest exchange rates for the current hourly window.
+
+    The currency code is normalised here, before the cached call hashes its
+    arguments, so "usd" and "USD" share one cache entry. Errors are shown in
+    the page and None is returned.
+    """
     try:
-        response = requests.get(api_url)
-        response.raise_for_status()  # Raises an HTTPError for bad responses (4xx or 5xx)
-        data = response.json()
-        if data.get("result") == "success":
-            return data["rates"]
-        else:
-            st.error(f"API Error: {data.get('error-type', 'Unknown error')}")
-            return None
+        return _fetch_live_rates(base_currency.upper(), _ttl_window())
     except requests.exceptions.RequestException as e:
         st.error(f"Network Error: Could not connect to the API. {e}")
-        return None
+    except orjson.JSONDecodeError as e:
+        st.error(f"API Error: Could not parse the response. {e}")
+    except RatesAPIError as e:
+        st.error(f"API Error: {e}")
+    return None
+
+
+def warm_live_rates(base_currency):
+    """Fills the rates cache ahead of the first conversion without showing errors."""
+    try:
+        _fetch_live_rates(base_currency.upper(), _ttl_window())
+    except (requests.exceptions.RequestException, orjson.JSONDecodeError, RatesAPIError):
+        pass
+
+
+def convert_all(amount, rates):
+    """Converts the amount into every common currency using one rates table."""
+    return {c: amount * r for c, r in rates.items() if c in _CURRENCY_SET}
 
 
 # --- UI Configuration ---
@@ -32,22 +152,30 @@ st.markdown("This app fetches the latest exchange rates to provide accurate conv
 
 # --- User Input Fields ---
 common_currencies = ["USD", "EUR", "GBP", "JPY", "CAD", "AUD", "CHF", "CNY", "INR", "BRL", "RUB", "ZAR"]
+_CURRENCY_SET = frozenset(common_currencies)
+
+# Inputs live in a form so editing them does not rerun the script until Convert is pressed.
+with st.form("convert", clear_on_submit=False):
+    col1, col2, col3 = st.columns(3)
 
-col1, col2, col3 = st.columns(3)
+    with col1:
+        amount = st.number_input("Amount", min_value=0.01, value=100.00, step=1.00, format="%.2f")
 
-with col1:
-    amount = st.number_input("Amount", min_value=0.01, value=100.00, step=1.00, format="%.2f")
+    with col2:
+        from_currency = st.selectbox("From", common_currencies, index=common_currencies.index("USD"))
 
-with col2:
-    from_currency = st.selectbox("From", common_currencies, index=common_currencies.index("USD"))
+    with col3:
+        to_currency = st.selectbox("To", common_currencies, index=common_currencies.index("INR"))
 
-with col3:
-    to_currency = st.selectbox("To", common_currencies, index=common_currencies.index("INR"))
+    compare_all = st.checkbox("Also convert into all listed currencies")
+
+    submitted = st.form_submit_button("Convert", type="primary", use_container_width=True)
 
 # --- Conversion Logic and Display ---
-if st.button("Convert", type="primary", use_container_width=True):
-    if from_currency and to_currency and amount > 0:
-        rates = get_live_rates(from_currency)
+if submitted:
+    if from_currency in _CURRENCY_SET and to_currency in _CURRENCY_SET:
+        with st.spinner("Fetching exchange rates..."):
+            rates = get_live_rates(from_currency)
         
         if rates:
             conversion_rate = rates.get(to_currency)
@@ -60,11 +188,22 @@ if st.button("Convert", type="primary", use_container_width=True):
                 result_text = f"## {amount:,.2f} {from_currency} = {converted_amount:,.2f} {to_currency}"
                 st.markdown(result_text)
                 st.info(f"**Live Exchange Rate:** `1 {from_currency} = {conversion_rate:.4f} {to_currency}`")
+
+                if compare_all:
+                    # The whole table is already cached, so this costs no extra API calls.
+                    results = convert_all(amount, rates)
+                    st.dataframe(pd.DataFrame.from_dict(results, orient="index", columns=[f"{amount:,.2f} {from_currency} in"]))
             else:
                 st.error(f"Could not find the exchange rate for {to_currency}.")
     else:
-        st.warning("Please fill in all the fields correctly.")
+        st.warning("Please choose currencies from the list.")
 
 st.markdown("---")
-st.markdown(f"Rates are fetched from [ExchangeRate-API](https://www.exchangerate-api.com/) and are valid as of **{date.today().strftime('%Y-%m-%d')}**.")
+st.markdown(f"Rates are fetched from [ExchangeRate-API](https://www.exchangerate-api.com/) and are valid as of **{date.today().isoformat()}**.")
 
+# --- Cache Warm-up ---
+# Runs after the page has rendered so the first USD conversion is served
+# from the cache instead of paying the network round-trip on click.
+if "warmed" not in st.session_state:
+    st.session_state["warmed"] = True
+    warm_live_rates("USD")